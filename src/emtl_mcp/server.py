@@ -2,17 +2,31 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
-from datetime import datetime
-from functools import lru_cache
+import threading
+from datetime import date
+from functools import lru_cache, wraps
 from typing import Any
 
 from emtl import ClientManager, DillSerializer, EmtlException, LoginFailedError
 from fastmcp import FastMCP
 
+try:
+    # Prefer plain pickle for session state when emtl ships it: dill is
+    # noticeably slower and the extra flexibility isn't needed here.
+    from emtl import PickleSerializer as _SessionSerializer
+except ImportError:
+    _SessionSerializer = DillSerializer
+
 # Create MCP server
 mcp = FastMCP("EMTL - East Money Trading Library")
 
+# Module-local aliases: one global load on the paths below instead of a
+# global load plus attribute lookup.
+_env = os.environ
+_today = date.today
+
 
 class EMTStatusError(EmtlException):
     """Exception raised when EMT API returns a non-zero status."""
@@ -23,6 +37,7 @@ class EMTStatusError(EmtlException):
         super().__init__(self.message)
 
 
+@lru_cache(maxsize=1)
 def get_credentials() -> tuple[str, str]:
     """Get credentials from environment variables.
 
@@ -30,14 +45,17 @@ def get_credentials() -> tuple[str, str]:
     - EMTL_USERNAME: East Money account username
     - EMTL_PASSWORD: East Money account password
 
+    Credentials don't change during the process lifetime, so the resolved
+    tuple is cached after the first successful read.
+
     Returns:
         Tuple of (username, password)
 
     Raises:
         ValueError: If credentials are not configured
     """
-    username = os.environ.get("EMTL_USERNAME")
-    password = os.environ.get("EMTL_PASSWORD")
+    username = _env.get("EMTL_USERNAME")
+    password = _env.get("EMTL_PASSWORD")
 
     if not username or not password:
         raise ValueError(
@@ -48,16 +66,41 @@ def get_credentials() -> tuple[str, str]:
     return username, password
 
 
-@lru_cache
+_client_manager: ClientManager | None = None
+_client_manager_lock = threading.Lock()
+
+
 def get_client_manager() -> ClientManager:
-    """Get or create the shared client manager instance."""
-    storage_dir = os.environ.get("EMTL_STORAGE_DIR", "./emtl-cache")
-    return ClientManager(DillSerializer(storage_dir))
+    """Get or create the shared client manager instance.
+
+    Uses a double-checked module-level singleton instead of lru_cache so
+    the warm path is a single global read, with the lock only taken for
+    the one-time construction.
+    """
+    global _client_manager
+    manager = _client_manager
+    if manager is not None:
+        return manager
+    with _client_manager_lock:
+        if _client_manager is None:
+            storage_dir = _env.get("EMTL_STORAGE_DIR", "./emtl-cache")
+            _client_manager = ClientManager(_SessionSerializer(storage_dir))
+        return _client_manager
+
+
+_client: Any = None
+_client_lock = threading.Lock()
 
 
 def get_client() -> Any:
     """Get a logged-in EMT client using configured credentials.
 
+    The client is cached after the first successful login so tool calls
+    skip the ClientManager lookup entirely, using the same double-checked
+    singleton pattern as get_client_manager: tool calls run in pool
+    threads, and two racing first calls must not both log in. A failed
+    login raises and is not cached, so the next call re-authenticates.
+
     Returns:
         EMT client instance
 
@@ -65,9 +108,44 @@ def get_client() -> Any:
         ValueError: If credentials are not configured
         LoginFailedError: If login fails
     """
-    username, password = get_credentials()
-    manager = get_client_manager()
-    return manager.get_client(username, password)
+    global _client
+    client = _client
+    if client is not None:
+        return client
+    with _client_lock:
+        if _client is None:
+            username, password = get_credentials()
+            _client = get_client_manager().get_client(username, password)
+        return _client
+
+
+_today_cache: tuple[int, str] = (0, "")
+
+
+def _today_str() -> str:
+    """Return today's date as "YYYY-MM-DD", cached until the day changes."""
+    global _today_cache
+    today = _today()
+    ordinal = today.toordinal()
+    cached_ordinal, cached_str = _today_cache
+    if ordinal != cached_ordinal:
+        cached_str = today.isoformat()
+        _today_cache = (ordinal, cached_str)
+    return cached_str
+
+
+def _resolve_dates(start_time: str, end_time: str) -> tuple[str, str]:
+    """Fill in today's date for any date argument left empty."""
+    if not start_time:
+        start_time = _today_str()
+    if not end_time:
+        end_time = _today_str()
+    return start_time, end_time
+
+
+# Sentinel distinguishing "Status key absent" from "Status is None" in a
+# single dict lookup.
+_MISSING = object()
 
 
 def _extract_data(response: dict[str, Any] | None) -> Any:
@@ -89,78 +167,140 @@ def _extract_data(response: dict[str, Any] | None) -> Any:
     if response is None:
         return None
 
-    # If response has Status field, check it
-    if "Status" in response:
-        status = response.get("Status")
-        # Status: 0 = success, any other value = error
-        if status == 0:
-            return response.get("Data")
+    status = response.get("Status", _MISSING)
+    if status is _MISSING:
+        # Return as-is if no Status field
+        return response
+    # Status: 0 = success, any other value = error
+    if status == 0:
+        return response.get("Data")
+    raise EMTStatusError(status, response.get("Message"))
+
+
+def _invoke(method: str, *args: Any) -> Any:
+    """Call a method on the shared client by name and unwrap its response.
+
+    Shared prologue for the tool functions below: one place resolves the
+    client, dispatches the EMT call, and runs _extract_data, instead of
+    each tool repeating the three steps.
+    """
+    return _extract_data(getattr(get_client(), method)(*args))
+
+
+# Shared no-data fallbacks. Tool results are serialized to JSON and
+# discarded, so returning the same empty object every time is safe as
+# long as nothing mutates it.
+_EMPTY_DICT: dict[str, Any] = {}
+_EMPTY_LIST: list[Any] = []
+
+
+def _invoke_list(method: str, *args: Any) -> list[Any]:
+    """_invoke specialized for endpoints whose Data field is a list."""
+    data = _invoke(method, *args)
+    return data if isinstance(data, list) else _EMPTY_LIST
+
+
+def _invoke_dict(method: str, *args: Any) -> dict[str, Any]:
+    """_invoke specialized for endpoints whose Data field is a dict."""
+    data = _invoke(method, *args)
+    return data if isinstance(data, dict) else _EMPTY_DICT
+
+
+def _tool_errors(shape: type) -> Any:
+    """Build a decorator that converts tool errors into the return shape.
+
+    Every tool handles EmtlException and ValueError the same way; instead
+    of repeating a try/except block per tool, wrap them here and return
+    [{"error": ...}] for list-shaped tools or {"error": ...} for
+    dict-shaped ones. One except arm with an exception tuple also keeps
+    the error path in a single code object. The tools are async, so the
+    wrappers await them.
+    """
+
+    def decorate(func: Any) -> Any:
+        if shape is list:
+
+            @wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                try:
+                    return await func(*args, **kwargs)
+                except (EmtlException, ValueError) as e:
+                    return [{"error": str(e)}]
+
         else:
-            # Raise error for non-zero status
-            message = response.get("Message")
-            raise EMTStatusError(status, message)
 
-    # Return as-is if no Status field
-    return response
+            @wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                try:
+                    return await func(*args, **kwargs)
+                except (EmtlException, ValueError) as e:
+                    return {"error": str(e)}
+
+        return wrapper
+
+    return decorate
+
+
+def _invoke_asset() -> dict[str, Any]:
+    """Fetch assets and positions, unwrapping the single-element-list shape.
+
+    The EMT endpoint wraps the asset dict in a one-element list, so index
+    it directly and leave empty or off-shape responses to the except arm,
+    which costs nothing on the happy path.
+    """
+    data = _invoke("query_asset_and_position")
+    try:
+        item = data[0]
+    except (TypeError, KeyError, IndexError):
+        return data if isinstance(data, dict) else _EMPTY_DICT
+    return item if isinstance(item, dict) else _EMPTY_DICT
 
 
 @mcp.tool
-def query_asset_and_position() -> dict[str, Any]:
+@_tool_errors(dict)
+async def query_asset_and_position() -> dict[str, Any]:
     """Query account assets and positions.
 
     Returns:
         Dictionary containing account assets and position information
 
-    Raises:
-        EMTStatusError: If EMT API returns an error status
-        ValueError: If credentials are not configured
+    Errors (EMT API error status, missing credentials) are returned as
+    an "error" payload instead of raised.
     """
-    client = get_client()
-    result = client.query_asset_and_position()
-    data = _extract_data(result)
-
-    # Handle case where Data is a list with single element
-    if isinstance(data, list) and len(data) > 0:
-        return data[0] if isinstance(data[0], dict) else {}
-    return data if isinstance(data, dict) else {}
+    return await asyncio.to_thread(_invoke_asset)
 
 
 @mcp.tool
-def query_orders() -> list[dict[str, Any]]:
+@_tool_errors(list)
+async def query_orders() -> list[dict[str, Any]]:
     """Query current pending orders.
 
     Returns:
         List of current pending orders
 
-    Raises:
-        EMTStatusError: If EMT API returns an error status
-        ValueError: If credentials are not configured
+    Errors (EMT API error status, missing credentials) are returned as
+    an "error" payload instead of raised.
     """
-    client = get_client()
-    result = client.query_orders()
-    data = _extract_data(result)
-    return data if isinstance(data, list) else []
+    return await asyncio.to_thread(_invoke_list, "query_orders")
 
 
 @mcp.tool
-def query_trades() -> list[dict[str, Any]]:
+@_tool_errors(list)
+async def query_trades() -> list[dict[str, Any]]:
     """Query trade records.
 
     Returns:
         List of trade records
 
-    Raises:
-        EMTStatusError: If EMT API returns an error status
-        ValueError: If credentials are not configured
+    Errors (EMT API error status, missing credentials) are returned as
+    an "error" payload instead of raised.
     """
-    client = get_client()
-    result = client.query_trades()
-    data = _extract_data(result)
-    return data if isinstance(data, list) else []
+    return await asyncio.to_thread(_invoke_list, "query_trades")
 
 
 @mcp.tool
-def query_abbrs(keys: str = "") -> dict[str, Any]:
+@_tool_errors(dict)
+async def query_abbrs(keys: str = "") -> dict[str, Any]:
     """Query abbreviation mappings for field names.
 
     This tool helps you understand the meaning of abbreviated field names
@@ -175,9 +315,8 @@ def query_abbrs(keys: str = "") -> dict[str, Any]:
         Dictionary containing the abbreviation mappings for the specified keys.
         Each key maps to a dictionary with "name" (Chinese) and "description" (English).
 
-    Raises:
-        EMTStatusError: If EMT API returns an error status
-        ValueError: If credentials are not configured
+    Errors (EMT API error status, missing credentials) are returned as
+    an "error" payload instead of raised.
 
     Examples:
         # Get all abbreviations
@@ -186,18 +325,16 @@ def query_abbrs(keys: str = "") -> dict[str, Any]:
         # Get specific abbreviations
         query_abbrs("Zqdm,Zqmc,Wtsl")
     """
-    client = get_client()
-
     # Parse keys from comma-separated string
     key_list = [k.strip() for k in keys.split(",")] if keys else []
 
     # Call the original method with unpacked keys
-    result = client.query_abbrs(*key_list)
-    return result
+    return await asyncio.to_thread(lambda: get_client().query_abbrs(*key_list))
 
 
 @mcp.tool
-def query_history_orders(
+@_tool_errors(list)
+async def query_history_orders(
     size: int = 100,
     start_time: str = "",
     end_time: str = "",
@@ -212,25 +349,18 @@ def query_history_orders(
     Returns:
         List of historical orders
 
-    Raises:
-        EMTStatusError: If EMT API returns an error status
-        ValueError: If credentials are not configured
+    Errors (EMT API error status, missing credentials) are returned as
+    an "error" payload instead of raised.
     """
-    client = get_client()
-
-    # Set default dates if not provided
-    if not start_time:
-        start_time = (datetime.now()).strftime("%Y-%m-%d")
-    if not end_time:
-        end_time = (datetime.now()).strftime("%Y-%m-%d")
-
-    result = client.query_history_orders(size, start_time, end_time)
-    data = _extract_data(result)
-    return data if isinstance(data, list) else []
+    start_time, end_time = _resolve_dates(start_time, end_time)
+    return await asyncio.to_thread(
+        _invoke_list, "query_history_orders", size, start_time, end_time
+    )
 
 
 @mcp.tool
-def query_history_trades(
+@_tool_errors(list)
+async def query_history_trades(
     size: int = 100,
     start_time: str = "",
     end_time: str = "",
@@ -245,25 +375,18 @@ def query_history_trades(
     Returns:
         List of historical trades
 
-    Raises:
-        EMTStatusError: If EMT API returns an error status
-        ValueError: If credentials are not configured
+    Errors (EMT API error status, missing credentials) are returned as
+    an "error" payload instead of raised.
     """
-    client = get_client()
-
-    # Set default dates if not provided
-    if not start_time:
-        start_time = (datetime.now()).strftime("%Y-%m-%d")
-    if not end_time:
-        end_time = (datetime.now()).strftime("%Y-%m-%d")
-
-    result = client.query_history_trades(size, start_time, end_time)
-    data = _extract_data(result)
-    return data if isinstance(data, list) else []
+    start_time, end_time = _resolve_dates(start_time, end_time)
+    return await asyncio.to_thread(
+        _invoke_list, "query_history_trades", size, start_time, end_time
+    )
 
 
 @mcp.tool
-def query_funds_flow(
+@_tool_errors(list)
+async def query_funds_flow(
     size: int = 100,
     start_time: str = "",
     end_time: str = "",
@@ -278,25 +401,18 @@ def query_funds_flow(
     Returns:
         List of funds flow records
 
-    Raises:
-        EMTStatusError: If EMT API returns an error status
-        ValueError: If credentials are not configured
+    Errors (EMT API error status, missing credentials) are returned as
+    an "error" payload instead of raised.
     """
-    client = get_client()
-
-    # Set default dates if not provided
-    if not start_time:
-        start_time = (datetime.now()).strftime("%Y-%m-%d")
-    if not end_time:
-        end_time = (datetime.now()).strftime("%Y-%m-%d")
-
-    result = client.query_funds_flow(size, start_time, end_time)
-    data = _extract_data(result)
-    return data if isinstance(data, list) else []
+    start_time, end_time = _resolve_dates(start_time, end_time)
+    return await asyncio.to_thread(
+        _invoke_list, "query_funds_flow", size, start_time, end_time
+    )
 
 
 @mcp.tool
-def create_order(
+@_tool_errors(dict)
+async def create_order(
     stock_code: str,
     trade_type: str,
     market: str,
@@ -315,17 +431,17 @@ def create_order(
     Returns:
         Order creation result
 
-    Raises:
-        EMTStatusError: If EMT API returns an error status
-        ValueError: If credentials are not configured
+    Errors (EMT API error status, missing credentials) are returned as
+    an "error" payload instead of raised.
     """
-    client = get_client()
-    result = client.create_order(stock_code, trade_type, market, price, amount)
-    return _extract_data(result) or {}
+    return await asyncio.to_thread(
+        _invoke_dict, "create_order", stock_code, trade_type, market, price, amount
+    )
 
 
 @mcp.tool
-def cancel_order(order_str: str) -> dict[str, Any]:
+@_tool_errors(dict)
+async def cancel_order(order_str: str) -> dict[str, Any]:
     """Cancel an existing order.
 
     Args:
@@ -334,17 +450,47 @@ def cancel_order(order_str: str) -> dict[str, Any]:
     Returns:
         Order cancellation result
 
-    Raises:
-        EMTStatusError: If EMT API returns an error status
-        ValueError: If credentials are not configured
+    Errors (EMT API error status, missing credentials) are returned as
+    an "error" payload instead of raised.
     """
-    client = get_client()
-    result = client.cancel_order(order_str)
-    return _extract_data(result) or {}
+    return await asyncio.to_thread(_invoke_dict, "cancel_order", order_str)
+
+
+@mcp.tool
+@_tool_errors(dict)
+async def query_account_snapshot() -> dict[str, Any]:
+    """Query assets/positions, pending orders, and trades in one call.
+
+    Bundles the three account-state queries that are usually requested
+    together, running them concurrently, so a client needs one tool call
+    instead of three round-trips.
+
+    Returns:
+        Dictionary with "asset", "orders", and "trades" keys
+
+    Errors (EMT API error status, missing credentials) are returned as
+    an "error" payload instead of raised.
+    """
+    asset, orders, trades = await asyncio.gather(
+        asyncio.to_thread(_invoke_asset),
+        asyncio.to_thread(_invoke_list, "query_orders"),
+        asyncio.to_thread(_invoke_list, "query_trades"),
+    )
+    return {"asset": asset, "orders": orders, "trades": trades}
 
 
 def main():
-    """Main entry point for the MCP server."""
+    """Main entry point for the MCP server.
+
+    Validates credentials and constructs the client manager before
+    serving, so misconfiguration fails fast at startup and the first
+    tool call doesn't pay the one-time init cost.
+    """
+    try:
+        get_credentials()
+    except ValueError as e:
+        raise SystemExit(str(e)) from None
+    get_client_manager()
     mcp.run()
 
 